@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Type,Literal
 from copy import deepcopy
 from pathlib import Path
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 def get_host_name():
     import os
@@ -43,33 +45,28 @@ def _need_delete_records(client: Client, table: Type[DeleteProcessTable]):
     return result
 
 def _del_unzipped_file(file_path):
-    import shutil
     if file_path:
         unzipped_path = Path(file_path)
-        if unzipped_path.exists():
-            if unzipped_path.is_dir():
-                shutil.rmtree(unzipped_path)
-            else:
-                unzipped_path.unlink()
+        # 路径不存在时is_dir()返回False，unlink(missing_ok=True)直接忽略，省去一次exists检查
+        if unzipped_path.is_dir():
+            shutil.rmtree(unzipped_path)
+        else:
+            unzipped_path.unlink(missing_ok=True)
 def _zip_file(file_path):
-    import shutil
     if file_path:
         zipped_path = Path(file_path)
-        if zipped_path.exists():
-            if zipped_path.is_dir():
-                shutil.rmtree(zipped_path)
-            else:
-                zipped_path.unlink()
+        if zipped_path.is_dir():
+            shutil.rmtree(zipped_path)
+        else:
+            zipped_path.unlink(missing_ok=True)
 
 def _source_file(file_path):
-    import shutil
     if file_path:
         source_path = Path(file_path)
-        if source_path.exists():
-            if source_path.is_dir():
-                shutil.rmtree(source_path)
-            else:
-                source_path.unlink()
+        if source_path.is_dir():
+            shutil.rmtree(source_path)
+        else:
+            source_path.unlink(missing_ok=True)
 
 def _delete_file(file_path):
     try:
@@ -106,8 +103,7 @@ class DeleteResult(BaseModel):
 
 
 
-def _update_delete_info(
-    client: Client, table: Type[DeleteProcessTable], item_id: int, delete_result: dict):
+def _create_delete_result(item_id: int, delete_result: dict) -> dict:
     if delete_result["result"] == "success":
         checked_upload_result = DeleteResult(
             id=item_id,
@@ -119,9 +115,16 @@ def _update_delete_info(
             fail_reason=delete_result["error_message"],
             status_result="failure"
         )
+    return checked_upload_result.model_dump()
+
 
+def _update_delete_info(
+    client: Client, table: Type[DeleteProcessTable], delete_results: list[dict]):
+    if not delete_results:
+        return {"result": "success", "error_message": ""}
     try:
-        client.update_data(table, [checked_upload_result.model_dump()])
+        # 所有记录的删除结果一次批量更新，只需一次数据库往返和一个事务
+        client.update_data(table, delete_results)
         return {"result": "success", "error_message": ""}
     except Exception as e:
         return {
@@ -129,7 +132,7 @@ def _update_delete_info(
             "error_message": {
                 "错误类型": "数据库更新失败",
                 "数据库模型": "DeleteProcessTable",
-                "记录ID": item_id,
+                "记录ID": [item["id"] for item in delete_results],
                 "错误时间": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "错误信息": str(e),
             },
@@ -149,13 +152,18 @@ def delete_process():
     delete_info = _create_delete_info(need_delete_records)
 
     error_message = []
-    for item_id, path in delete_info.items():
-        upload_result = _delete_file(path)
-        update_result = _update_delete_info(
-            client, DeleteProcessTable, item_id, upload_result
-        )
-        if update_result["result"] == "failure":
-            error_message.append(update_result["error_message"])
+    # 各记录的文件删除互不相关，删除与rmtree的系统调用会释放GIL，用线程池并行删除，map保持记录顺序
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        delete_results = [
+            _create_delete_result(item_id, delete_result)
+            for item_id, delete_result in zip(delete_info, executor.map(_delete_file, delete_info.values()))
+        ]
+    # 删除操作可以重复执行，无需逐条落库，汇总后批量更新删除状态
+    update_result = _update_delete_info(
+        client, DeleteProcessTable, delete_results
+    )
+    if update_result["result"] == "failure":
+        error_message.append(update_result["error_message"])
     if error_message:
         _send_error_notification(error_message)
     return update_result
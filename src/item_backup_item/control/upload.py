@@ -29,8 +29,7 @@ def _need_upload_records(client: Client, table: Type[UploadProcessTable]):
     return result
 
 
-def _upload_file(file_path):
-    upload_service = UploadService()
+def _upload_file(upload_service: UploadService, file_path):
     upload_result = upload_service.upload_file(file_path)
     if upload_result["errno"] == 0:
         return {"result": "success", "error_message": ""}
@@ -100,13 +99,15 @@ def upload_process():
     upload_info = _create_upload_info(need_upload_records)
 
     error_message = []
-    for item_id, path in upload_info.items():
-        upload_result = _upload_file(path)
-        update_result = _update_upload_info(
-            client, UploadProcessTable, item_id, upload_result
-        )
-        if update_result["result"] == "failure":
-            error_message.append(update_result["error_message"])
+    # 所有文件共用一个UploadService，环境变量只加载一次，API client的连接在文件之间复用
+    with UploadService() as upload_service:
+        for item_id, path in upload_info.items():
+            upload_result = _upload_file(upload_service, path)
+            update_result = _update_upload_info(
+                client, UploadProcessTable, item_id, upload_result
+            )
+            if update_result["result"] == "failure":
+                error_message.append(update_result["error_message"])
     if error_message:
         _send_error_notification(error_message)
     return update_result
@@ -15,6 +15,9 @@ class MySQLClient:
         self.engine = None
 
     def get_engine(self):
+        # 复用已创建的engine及其连接池，避免每次数据库操作都重新建立连接
+        if self.engine is not None:
+            return self.engine
         import os
         from dotenv import load_dotenv
         load_dotenv(self.env_file)
@@ -23,11 +26,11 @@ class MySQLClient:
         user = os.getenv('MYSQL_USER')
         password = os.getenv('MYSQL_PASSWORD')
         database = self.database or os.getenv('MYSQL_DATABASE')
-        self.engine = create_engine(f'mysql+pymysql://{user}:{password}@{host}:{port}/{database}', **self.db_config)
-        try:
-            self.engine.connect()
-        except Exception as e:
-            raise e
+        engine = create_engine(f'mysql+pymysql://{user}:{password}@{host}:{port}/{database}', **self.db_config)
+        # 建立一次连接确认数据库可用，用完立即归还连接池，连接失败时不缓存engine
+        with engine.connect():
+            pass
+        self.engine = engine
         return self.engine
 
     def init_schema(self):
@@ -1,6 +1,9 @@
 
+import os
+import stat
 import pathlib
 from os import PathLike
+from concurrent.futures import ThreadPoolExecutor
 from ..config import ZipConfig,ClassifyConfig
 
 
@@ -11,28 +14,44 @@ def is_zip_file(item:pathlib.Path):
     """
     return item.suffix in ZipConfig.zipped_suffix
 
-def is_file_oversize(item:pathlib.Path):
+def is_file_oversize(size:int):
     """
     判断文件大小是否合规，由CLASSIFY_CONFIG.file_oversize决定
+    @param size: 文件大小
     """
-    return item.is_file() and item.stat().st_size > ClassifyConfig.file_oversize
+    return size > ClassifyConfig.file_oversize
 
 def is_empty_folder(item:pathlib.Path):
     return item.is_dir() and not any(item.iterdir())
 
 
-def is_folder_oversize(item:list[pathlib.Path]):
+def is_folder_oversize(sizes:list[int]):
     """
     判断文件夹大小是否合规，由CLASSIFY_CONFIG.folder_oversize决定
+    @param sizes: 文件夹内所有文件的大小列表
     """
-    return sum([i.stat().st_size for i in item]) > ClassifyConfig.folder_oversize
+    return sum(sizes) > ClassifyConfig.folder_oversize
 
 
-def is_folder_overcount(item:list[pathlib.Path]):
+def is_folder_overcount(sizes:list[int]):
     """
     判断文件夹是否包含超过CLASSIFY_CONFIG.overcount限定的文件数量
+    @param sizes: 文件夹内每个文件对应一项的列表，只统计其中的项数
     """
-    return len(item) > ClassifyConfig.overcount
+    return len(sizes) > ClassifyConfig.overcount
+
+
+def _iter_file_sizes(folder:str|pathlib.Path):
+    """
+    用os.scandir递归遍历文件夹，逐个返回文件大小
+    DirEntry自带文件类型信息，每个文件只需一次stat，不会对同一文件重复stat
+    """
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_file_sizes(entry.path)
+            elif entry.is_file():
+                yield entry.stat().st_size
 
 
 
@@ -45,26 +64,32 @@ def classify_item(item:PathLike):
 
 
     item = pathlib.Path(item)
-    if not item.exists():
-        raise FileNotFoundError(f"item {item} not exists")
+    # 只stat一次，存在性、文件类型与文件大小都从同一个stat结果中获取
+    try:
+        item_stat = item.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"item {item} not exists") from None
     
-    if item.is_file():
-        if is_file_oversize(item):
-            return {item:{'classify_result':'oversize_file','item_type':'file','item_size':item.stat().st_size}}
+    if stat.S_ISREG(item_stat.st_mode):
+        item_size = item_stat.st_size
+        if is_file_oversize(item_size):
+            return {item:{'classify_result':'oversize_file','item_type':'file','item_size':item_size}}
         elif is_zip_file(item):
-            return {item:{'classify_result':'zip_file','item_type':'file','item_size':item.stat().st_size}}
+            return {item:{'classify_result':'zip_file','item_type':'file','item_size':item_size}}
         else:
-            return {item:{'classify_result':'normal_file','item_type':'file','item_size':item.stat().st_size}}
-    elif item.is_dir():
+            return {item:{'classify_result':'normal_file','item_type':'file','item_size':item_size}}
+    elif stat.S_ISDIR(item_stat.st_mode):
         if is_empty_folder(item):
             return {item:{'classify_result':'empty_folder','item_type':'folder','item_size':0}}
-        all_file_iter = [i for i in item.rglob("*") if i.is_file()]
-        if is_folder_overcount(all_file_iter):
-            return {item:{'classify_result':'overcount_folder','item_type':'folder','item_size':sum([i.stat().st_size for i in all_file_iter])}}
-        elif is_folder_oversize(all_file_iter):
-            return {item:{'classify_result':'oversize_folder','item_type':'folder','item_size':sum([i.stat().st_size for i in all_file_iter])}}
+        # 一次遍历取得所有文件大小，文件数量、文件夹大小的判断都复用该列表
+        all_file_sizes = list(_iter_file_sizes(item))
+        item_size = sum(all_file_sizes)
+        if is_folder_overcount(all_file_sizes):
+            return {item:{'classify_result':'overcount_folder','item_type':'folder','item_size':item_size}}
+        elif is_folder_oversize(all_file_sizes):
+            return {item:{'classify_result':'oversize_folder','item_type':'folder','item_size':item_size}}
         else:
-            return {item:{'classify_result':'normal_folder','item_type':'folder','item_size':sum([i.stat().st_size for i in all_file_iter])}}
+            return {item:{'classify_result':'normal_folder','item_type':'folder','item_size':item_size}}
 
 
 def classify_folder(folder:PathLike|str|pathlib.Path):
@@ -77,4 +102,10 @@ def classify_folder(folder:PathLike|str|pathlib.Path):
     print(folder)
     if not folder.exists():
         raise FileNotFoundError(f"folder {folder} not exists")
-    return [classify_item(i) for i in folder.glob("*")]
+    items = list(folder.glob("*"))
+    # 只有一个项目时无需线程池
+    if len(items) <= 1:
+        return [classify_item(i) for i in items]
+    # 各项目的分类互不相关，目录遍历与stat会释放GIL，用线程池并行分类，map保持原有顺序
+    with ThreadPoolExecutor(max_workers=min(8, len(items))) as executor:
+        return list(executor.map(classify_item, items))
@@ -1,17 +1,55 @@
 from pathlib import Path
 import os
+import asyncio
+import queue
+import threading
+import aiohttp
 from dotenv import load_dotenv
 import hashlib
 from pprint import pprint
 from .openapi_client.api import fileupload_api
 from . import openapi_client
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from functools import lru_cache
 from .utils import extract_date_and_password_from_path
 load_dotenv()
 
 
+@lru_cache(maxsize=256)
+def _extract_cached(parent:str) -> tuple[str|None, str|None]:
+    """
+    按所在目录缓存日期与密码的提取结果，同一目录下的文件无需重复匹配目录部分
+    文件名中也可能带有日期或密码，由调用方对文件名单独补充匹配
+    """
+    return extract_date_and_password_from_path(parent)
+
+
+def _hash_range(file_path:str|Path, offset:int, length:int, step:int = 1024*1024) -> str:
+    """
+    计算文件中[offset, offset+length)区间的MD5值，按step大小循环读入复用的缓冲区
+    hashlib在update时会释放GIL，可以提交到线程池中并行计算各分片的MD5
+    """
+    md5_hash = hashlib.md5()
+    buffer = memoryview(bytearray(step))
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        remaining = length
+        while remaining > 0:
+            read_size = f.readinto(buffer[:min(step, remaining)])
+            if not read_size:
+                break
+            md5_hash.update(buffer[:read_size])
+            remaining -= read_size
+    return md5_hash.hexdigest().lower()
+
+
 class UploadService:
-    def __init__(self, file_path:str|Path = '',chunk_size: int = 20*1024*1024, rtype: int = 1,env_path:str|Path ='upload.env',temp_dir:str|Path|None = None):
+    # 分片上传接口，绕过openapi_client直接用aiohttp并发请求
+    superfile2_url = 'https://d.pcs.baidu.com/rest/2.0/pcs/superfile2'
+
+    def __init__(self, file_path:str|Path = '',chunk_size: int = 20*1024*1024, rtype: int = 1,env_path:str|Path ='upload.env',temp_dir:str|Path|None = None,upload_concurrency: int = 8):
         self.file_path = Path(file_path)
         self.remote_path:str = None # type: ignore
         self.chunk_size:int = chunk_size
@@ -22,17 +60,40 @@ class UploadService:
         self.upload_id:str = None # type: ignore
         self.temp_dir = temp_dir
         self.tmp_list:list[Path] = None # type: ignore
+        self.upload_concurrency:int = upload_concurrency
+        # 分片临时目录池，key为源文件所在目录，同一实例上传的同目录文件复用同一个临时目录
+        self._temp_pool:dict[Path, Path] = {}
+        self._access_token:str = None # type: ignore
         self.load_env(env_path)
+        # precreate和create共用一个API client，保持连接池复用
+        self._api_client = openapi_client.ApiClient()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # 无论上传过程是否抛出异常，都清理分片文件与临时目录，并关闭API client
+        try:
+            self._clean_tmp()
+            self.release_temp_dirs()
+        finally:
+            self._api_client.close()
 
 
     def load_env(self,env_path:str|Path ='upload.env'):
         if not Path(env_path).exists():
             raise FileNotFoundError(f"env file:{env_path} not found,can not access")
         load_dotenv(env_path)
+        self._access_token = os.getenv("BAIDU_PAN_ACCESS_TOKEN")
 
     def _set_remote_path(self):
         temp_path = '/item_backup/'
-        date, password = extract_date_and_password_from_path(self.file_path.absolute().as_posix())
+        date, password = _extract_cached(self.file_path.parent.absolute().as_posix())
+        # 目录中未找到时再匹配文件名，文件名是路径的最后一部分，结果与匹配整个路径时一致
+        if not date or not password:
+            name_date, name_password = extract_date_and_password_from_path(self.file_path.name)
+            date = date or name_date
+            password = password or name_password
         date = date or datetime.now().strftime("%Y%m%d") 
         if not password:
             print(f"upload info Password is missing, please check your file path:{self.file_path},use unknown instead")
@@ -44,8 +105,6 @@ class UploadService:
         '''
         分片文件，设置self.tmp_list为分片文件列表，并且返回self.tmp_list
         '''
-        import shutil
-
         # 检查文件是否存在
         if not Path(self.file_path).exists():
             raise FileNotFoundError(f"file_path:{self.file_path} not exists")
@@ -56,71 +115,109 @@ class UploadService:
             self.tmp_list = [self.file_path]
             return self.tmp_list
 
-        # 确保临时目录存在
+        # 确保临时目录存在，未指定时从临时目录池中取出同目录下复用的临时目录
         if not self.temp_dir:
-            self.temp_dir = self.file_path.parent / f"temp_{self.file_path.name}"
+            self.temp_dir = self._temp_pool.setdefault(self.file_path.parent, self.file_path.parent / "temp_upload")
         self.temp_dir = Path(self.temp_dir)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
-        # 清空临时目录，确保没有残留文件
-        shutil.rmtree(self.temp_dir)
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        # 只删除本文件残留的分片文件，不再清空并重建整个临时目录
+        self._remove_parts()
 
         
         # 4. 初始化存储分块文件路径的列表和分块计数器
         paths:list[Path] = []
         partnum = 0
         
-        # 5. 以二进制读模式打开源文件
-        with open(self.file_path, 'rb') as inputfile:
-            # 6. 从源文件路径中提取文件名（不包含目录）
-            file_name = self.file_path.name
-            
-            # 7. 循环读取源文件，直到文件结束
-            while True:
-                # 8. 读取指定大小的数据块
-                chunk = inputfile.read(self.chunk_size)
-                
-                # 9. 如果读取到的数据为空，说明已到文件末尾，退出循环
-                if not chunk:
+        # 5. 以二进制只读方式打开源文件，直接使用文件描述符，省去Python文件对象的缓冲层
+        binary_flag = getattr(os, 'O_BINARY', 0)  # Windows下需要二进制模式，其他平台为0
+        fd_in = os.open(self.file_path, os.O_RDONLY | binary_flag)
+
+        # 6. 读取线程预读下一个数据块，主线程写入当前数据块，读写重叠进行
+        # 队列最多缓存2个数据块，限制内存占用；os.read/os.write都会释放GIL
+        chunks: queue.Queue[bytes|bytearray|None] = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        reader_errors: list[BaseException] = []
+
+        def read_chunk() -> bytes|bytearray:
+            # 单次os.read可能返回少于请求的字节数，循环读取直到凑满chunk_size或到达文件末尾，
+            # 保证除最后一个分片外每个分片都恰好为chunk_size字节，与按固定区间计算的MD5列表一致
+            data = os.read(fd_in, self.chunk_size)
+            if not data or len(data) == self.chunk_size:
+                return data
+            buffer = bytearray(data)
+            while len(buffer) < self.chunk_size:
+                more = os.read(fd_in, self.chunk_size - len(buffer))
+                if not more:
                     break
-                
-                # 10. 构建分块文件的完整路径，使用路径拼接运算符 `/`
+                buffer += more
+            return buffer
+
+        def reader():
+            try:
+                while not stop.is_set() and (data := read_chunk()):
+                    chunks.put(data)
+            except BaseException as e:
+                reader_errors.append(e)
+            finally:
+                # 以None标记读取结束
+                chunks.put(None)
+
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+        chunk: bytes|bytearray|None = b''
+        try:
+            # 7. 从源文件路径中提取文件名（不包含目录）
+            file_name = self.file_path.name
+
+            # 8. 从队列中取出数据块，取到None说明已到文件末尾，退出循环
+            while (chunk := chunks.get()) is not None:
+                # 9. 构建分块文件的完整路径，使用路径拼接运算符 `/`
                 filename = self.temp_dir / f'{file_name}.part{partnum:04d}'
-                
-                # 11. 将分块文件路径（Path对象）添加到列表中
+
+                # 10. 将分块文件路径（Path对象）添加到列表中
                 paths.append(filename)
-                
-                # 12. 以二进制写模式创建并打开分块文件，写入数据块
-                with open(filename, 'wb') as fileobj:
-                    fileobj.write(chunk)
-                
-                # 13. 分块计数器加1，为下一个分块文件准备
+
+                # 11. 创建分块文件，循环写入直到数据块全部写完
+                fd_out = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | binary_flag, 0o644)
+                try:
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[os.write(fd_out, view):]
+                finally:
+                    os.close(fd_out)
+
+                # 12. 分块计数器加1，为下一个分块文件准备
                 partnum += 1
-        
+        finally:
+            # 13. 写入出错时通知读取线程停止并取空队列，等读取线程结束后再关闭源文件
+            stop.set()
+            while chunk is not None:
+                chunk = chunks.get()
+            reader_thread.join()
+            os.close(fd_in)
+
+        # 读取线程中的异常在主线程重新抛出
+        if reader_errors:
+            raise reader_errors[0]
+
         # 14. 返回所有分块文件的路径列表
         self.tmp_list = paths
         return self.tmp_list
 
 
-    def _calculate_md5(self,data):
-        """
-        计算数据的MD5值
-        :param data: 数据
-        :return: MD5值
-        """
-        md5_hash = hashlib.md5()
-        md5_hash.update(data)
-        return md5_hash.hexdigest().lower()
-
     def _create_block_list(self):
-        import json
-        block_list = []
         self._split_file()
-        for file_path in self.tmp_list:
-            with open(file_path, 'rb') as f:
-                md5 = self._calculate_md5(f.read())
-                block_list.append(md5)
-        return json.dumps(block_list)
+        # 直接对源文件按分片区间计算MD5，各区间互不相关，可以多线程并行计算
+        size = self.file_path.stat().st_size
+        offsets = range(0, max(size, 1), self.chunk_size)
+        lengths = [min(self.chunk_size, size - offset) for offset in offsets]
+        if len(offsets) == 1:
+            # 无需分块的文件直接用hashlib.file_digest计算，内部复用缓冲区循环读取
+            with open(self.file_path, 'rb') as f:
+                return '["' + hashlib.file_digest(f, 'md5').hexdigest() + '"]'
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            # MD5值固定为32位十六进制字符，无需转义，按顺序直接拼接成JSON字符串数组
+            return '["' + '","'.join(executor.map(_hash_range, repeat(self.file_path), offsets, lengths)) + '"]'
     
 
     def precreate(self):
@@ -132,29 +229,29 @@ class UploadService:
         if not self.file_path.is_file():
             raise ValueError(f"file_path:{self.file_path} is not a file,folder is not supported")
         self._set_remote_path()
-        #    Enter a context with an instance of the API client
-        with openapi_client.ApiClient() as api_client:
-            # Create an instance of the API class
-            api_instance = fileupload_api.FileuploadApi(api_client)
-            access_token = os.getenv("BAIDU_PAN_ACCESS_TOKEN")  # str |
-            path = self.remote_path  # str | 对于一般的第三方软件应用，路径以 "/apps/your-app-name/" 开头。对于小度等硬件应用，路径一般 "/来自：小度设备/" 开头。对于定制化配置的硬件应用，根据配置情况进行填写。
-            isdir = 0  # int | isdir
-            self.size = self.file_path.stat().st_size  # int | size
-            autoinit = 1  # int | autoinit
-            self.block_list_jsonstr = self._create_block_list() # str | 由MD5字符串组成的list
-            rtype = self.rtype  # int | rtype (optional)
-            # example passing only required values which don't have defaults set
-            # and optional values
-            try:
-                api_response = api_instance.xpanfileprecreate(
-                    access_token, path, isdir, self.size, autoinit, self.block_list_jsonstr, rtype=rtype)
-                print(api_response)
-                self.upload_id = api_response['uploadid']
-                self.block_list = api_response['block_list']
-                return self
-            except openapi_client.ApiException as e:
-                print("Exception when calling FileuploadApi->xpanfileprecreate: %s\n" % e)
-                exit(-1)
+        # Reuse the API client shared by precreate and create
+        api_client = self._api_client
+        # Create an instance of the API class
+        api_instance = fileupload_api.FileuploadApi(api_client)
+        access_token = self._access_token  # str |
+        path = self.remote_path  # str | 对于一般的第三方软件应用，路径以 "/apps/your-app-name/" 开头。对于小度等硬件应用，路径一般 "/来自：小度设备/" 开头。对于定制化配置的硬件应用，根据配置情况进行填写。
+        isdir = 0  # int | isdir
+        self.size = self.file_path.stat().st_size  # int | size
+        autoinit = 1  # int | autoinit
+        self.block_list_jsonstr = self._create_block_list() # str | 由MD5字符串组成的list
+        rtype = self.rtype  # int | rtype (optional)
+        # example passing only required values which don't have defaults set
+        # and optional values
+        try:
+            api_response = api_instance.xpanfileprecreate(
+                access_token, path, isdir, self.size, autoinit, self.block_list_jsonstr, rtype=rtype)
+            print(api_response)
+            self.upload_id = api_response['uploadid']
+            self.block_list = api_response['block_list']
+            return self
+        except openapi_client.ApiException as e:
+            print("Exception when calling FileuploadApi->xpanfileprecreate: %s\n" % e)
+            exit(-1)
     
     def _get_file(self, partseq):
         try:
@@ -163,28 +260,55 @@ class UploadService:
         except Exception as e:
             print(f"Exception when open file:{e}")
             exit(-1)
+
+    async def _upload_one(self, session:aiohttp.ClientSession, semaphore:asyncio.Semaphore, access_token:str, partseq):
+        params = {
+            'method': 'upload',
+            'openapi': 'xpansdk',
+            'access_token': access_token,
+            'partseq': str(partseq),
+            'path': self.remote_path,
+            'uploadid': self.upload_id,
+            'type': 'tmpfile',
+        }
+        async with semaphore:
+            with self._get_file(partseq) as file:  # file_type | 要进行传送的本地文件分片
+                data = aiohttp.FormData()
+                data.add_field('file', file, filename=Path(file.name).name)
+                try:
+                    async with session.post(self.superfile2_url, params=params, data=data) as response:
+                        # 非2xx响应(如网关返回的HTML错误页)按失败处理，不再尝试解析JSON
+                        response.raise_for_status()
+                        api_response = await response.json(content_type=None)
+                        pprint(api_response)
+                        return api_response
+                # 上传失败时只打印，该分片上传失败，由create()返回errno不为0，不会中断整批文件的上传
+                # ClientResponseError的异常信息中包含带access_token的完整URL，只打印分片序号与状态
+                except aiohttp.ClientResponseError as e:
+                    print("Exception when calling superfile2: partseq %s, status %s, %s\n" % (partseq, e.status, e.message))
+                # 响应体不是合法JSON时会抛出ValueError(JSONDecodeError)，与网络错误一样处理
+                except (aiohttp.ClientError, ValueError) as e:
+                    print("Exception when calling superfile2: partseq %s, %s\n" % (partseq, e))
+
+    async def _upload_all(self):
+        access_token = self._access_token  # str |
+        semaphore = asyncio.Semaphore(self.upload_concurrency)
+        # 所有分片复用同一组keep-alive连接，连接数与并发数一致；
+        # 大分片在慢速上行链路上可能超过aiohttp默认的5分钟总超时，因此不限制总时长，
+        # 但仍限制建立连接与等待读取的时间，避免连接卡死时整个上传流程永远阻塞
+        connector = aiohttp.TCPConnector(limit_per_host=self.upload_concurrency)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=300)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            return await asyncio.gather(
+                *[self._upload_one(session, semaphore, access_token, partseq) for partseq in self.block_list]
+            )
+
     def upload(self):
         """
         upload
+        并发上传precreate返回的需要上传的分片，最多同时上传self.upload_concurrency个
         """
-        # Enter a context with an instance of the API client
-        with openapi_client.ApiClient() as api_client:
-            # Create an instance of the API class
-            api_instance = fileupload_api.FileuploadApi(api_client)
-            access_token = os.getenv("BAIDU_PAN_ACCESS_TOKEN")  # str |
-            for partseq in self.block_list:
-                path = self.remote_path  # str |
-                uploadid = self.upload_id  # str |
-                type = "tmpfile"  # str |
-                file = self._get_file(partseq)  # file_type | 要进行传送的本地文件分片
-                # example passing only required values which don't have defaults set
-                # and optional values
-                try:
-                    api_response = api_instance.pcssuperfile2(
-                        access_token, str(partseq), path, uploadid, type, file=file)
-                    pprint(api_response)
-                except openapi_client.ApiException as e:
-                    print("Exception when calling FileuploadApi->pcssuperfile2: %s\n" % e)
+        asyncio.run(self._upload_all())
         print("upload done")
         return self
 
@@ -192,49 +316,78 @@ class UploadService:
         """
         create
         """
-        # Enter a context with an instance of the API client
-        with openapi_client.ApiClient() as api_client:
-            # Create an instance of the API class
-            api_instance = fileupload_api.FileuploadApi(api_client)
-            access_token = os.getenv("BAIDU_PAN_ACCESS_TOKEN")  # str |
-            path = self.remote_path  # str | 与precreate的path值保持一致
-            isdir = 0  # int | isdir
-            size = self.size # int | 与precreate的size值保持一致
-            uploadid = self.upload_id  # str | precreate返回的uploadid
-            block_list = self.block_list_jsonstr  # str | 与precreate的block_list值保持一致
-            rtype = self.rtype  # int | rtype (optional)
-
-            # example passing only required values which don't have defaults set
-            # and optional values
-            try:
-                api_response = api_instance.xpanfilecreate(
-                    access_token, path, isdir, size, uploadid, block_list, rtype=rtype)
-                pprint(api_response)
-                return api_response
-            except openapi_client.ApiException as e:
-                print("Exception when calling FileuploadApi->xpanfilecreate: %s\n" % e)
+        # Reuse the API client shared by precreate and create
+        api_client = self._api_client
+        # Create an instance of the API class
+        api_instance = fileupload_api.FileuploadApi(api_client)
+        access_token = self._access_token  # str |
+        path = self.remote_path  # str | 与precreate的path值保持一致
+        isdir = 0  # int | isdir
+        size = self.size # int | 与precreate的size值保持一致
+        uploadid = self.upload_id  # str | precreate返回的uploadid
+        block_list = self.block_list_jsonstr  # str | 与precreate的block_list值保持一致
+        rtype = self.rtype  # int | rtype (optional)
+
+        # example passing only required values which don't have defaults set
+        # and optional values
+        try:
+            api_response = api_instance.xpanfilecreate(
+                access_token, path, isdir, size, uploadid, block_list, rtype=rtype)
+            pprint(api_response)
+            return api_response
+        except openapi_client.ApiException as e:
+            print("Exception when calling FileuploadApi->xpanfilecreate: %s\n" % e)
+
+    def _remove_parts(self):
+        '''
+        删除临时目录中属于self.file_path的分片文件(文件名.partNNNN)
+        '''
+        part_prefix = f'{self.file_path.name}.part'
+        # 临时目录不存在时直接返回，省去单独的exists检查
+        try:
+            entries = os.scandir(self.temp_dir)
+        except FileNotFoundError:
+            return
+        # 直接使用DirEntry的名称与路径字符串，不为每个目录项构造Path对象
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(part_prefix) and name[len(part_prefix):].isdigit():
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
+
     def _clean_tmp(self):
+        '''
+        清理本文件的分片文件，可重复调用
+        '''
         if self.temp_dir:
-            import shutil
-            shutil.rmtree(self.temp_dir)
+            self._remove_parts()
+
+    def release_temp_dirs(self):
+        '''
+        删除临时目录池中已经清空的临时目录，退出上下文时自动调用
+        '''
+        for temp_dir in self._temp_pool.values():
+            try:
+                temp_dir.rmdir()
+            except OSError:
+                pass
+        self._temp_pool.clear()
 
     def upload_file(self,file_path:str|Path,chunk_size: int = 20*1024*1024, rtype: int = 1,temp_dir:str|Path|None = None):
         self.file_path = Path(file_path)
         self.chunk_size = chunk_size
         self.rtype = rtype
         self.temp_dir = temp_dir
-        self.precreate()
-        self.upload()
-        result = self.create()
-        self._clean_tmp()
-        return result
-        
-    def __del__(self):
-        import shutil
-        if self.temp_dir:
-            temp_dir = Path(self.temp_dir)
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
+        # 上传失败或调用方未使用with时也清理本文件的分片文件，避免分片残留在源文件目录中
+        try:
+            self.precreate()
+            self.upload()
+            return self.create()
+        finally:
+            self._clean_tmp()
 
 
 
@@ -244,5 +397,5 @@ if __name__ == "__main__":
         'chunk_size': 20*1024*1024,
         'rtype': 1
     }
-    upload_service = UploadService(**params)
-    upload_service.precreate().upload().create()
+    with UploadService(**params) as upload_service:
+        upload_service.precreate().upload().create()
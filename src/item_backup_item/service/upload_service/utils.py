@@ -5,6 +5,16 @@ from pathlib import Path
 from typing import Tuple, Optional
 
 
+_PWD_RE = re.compile(r'(?:解压密码|密码)[_\-]([A-Za-z_\d]+)')  # 匹配"解压密码_"或"密码-"后的内容
+# 一次扫描同时匹配8位数字的日期(第1组)与密码(第2组)
+_DATE_OR_PWD_RE = re.compile(r'(?:(\d{8})|(?:解压密码|密码)[_\-]([A-Za-z_\d]+))')
+
+
+def _is_yyyymmdd(part: str) -> bool:
+    """判断路径部分是否恰好为8位ASCII数字，代替逐次调用正则匹配"""
+    return len(part) == 8 and part.isascii() and part.isdigit()
+
+
 def extract_date_and_password_from_path(path: str) -> Tuple[Optional[str], Optional[str]]:
     """
     从路径中提取日期和压缩密码
@@ -16,37 +26,25 @@ def extract_date_and_password_from_path(path: str) -> Tuple[Optional[str], Optio
     Returns:
         tuple: (date, password)，如果未找到则返回(None, None)
     """
-    path_obj = Path(path)
-    
-    # 获取路径的所有部分
-    parts = path_obj.parts
-    
-    date_pattern = r'(\d{8})'  # 匹配8位数字的日期格式
-    password_pattern = r'(?:解压密码|密码)[_\-]([A-Za-z_\d]+)'  # 匹配"解压密码_"或"密码-"后的内容
-    
     date = None
     password = None
     
-    for part in parts:
+    # 日期与密码标记不会跨越路径分隔符，直接对整个路径字符串做一次正则扫描
+    for match in _DATE_OR_PWD_RE.finditer(path):
+        potential_date, potential_password = match.groups()
         # 查找日期
-        date_match = re.search(date_pattern, part)
-        if date_match and not date:
-            potential_date = date_match.group(1)
+        if potential_date and not date:
             # 验证是否是有效的日期格式 YYYYMMDD
-            if len(potential_date) == 8:
-                try:
-                    year = int(potential_date[:4])
-                    month = int(potential_date[4:6])
-                    day = int(potential_date[6:8])
-                    if 1 <= month <= 12 and 1 <= day <= 31 and 1900 <= year <= 2100:
-                        date = potential_date
-                except ValueError:
-                    pass
-        
+            # 正则已保证是8位数字，一次int()转换后用整除拆分年月日，无需try
+            year, month_day = divmod(int(potential_date), 10000)
+            month, day = divmod(month_day, 100)
+            if 1 <= month <= 12 and 1 <= day <= 31 and 1900 <= year <= 2100:
+                date = potential_date
         # 查找密码
-        password_match = re.search(password_pattern, part)
-        if password_match and not password:
-            password = password_match.group(1)
+        elif potential_password and not password:
+            password = potential_password
+        if date and password:
+            break
     
     return date, password
 
@@ -68,18 +66,22 @@ def extract_date_and_password_from_path_strict(path: str) -> Tuple[Optional[str]
     date = None
     password = None
     
-    # 逐个检查路径部分
-    for i, part in enumerate(parts):
+    # 日期与密码位于路径最深的几层，倒序检查路径部分，两者都找到后提前结束
+    # 倒序时第一个匹配即为正序时最后一个匹配，结果与逐个正序检查一致
+    for part in reversed(parts):
         # 检查是否是8位数字的日期
-        if re.match(r'^\d{8}$', part):
+        if not date and _is_yyyymmdd(part):
             date = part
             
         # 检查是否包含密码信息
-        if '解压密码' in part or '密码' in part:
+        if not password and ('解压密码' in part or '密码' in part):
             # 提取"解压密码_"或类似格式后的部分
-            password_match = re.search(r'(?:解压密码|密码)[_\-]([A-Za-z_\d]+)', part)
+            password_match = _PWD_RE.search(part)
             if password_match:
                 password = password_match.group(1)
+
+        if date and password:
+            break
     
     return date, password
 
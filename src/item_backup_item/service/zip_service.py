@@ -1,5 +1,6 @@
 from dowhen import when
 import pyzipper
+import os
 from os import PathLike
 import pathlib
 import datetime
@@ -10,7 +11,7 @@ from ..config import ZipConfig
 def add_self_salt(self):
     self.salt = ZipConfig.salt[self.salt_length]
     
-def _add_file_to_zip(zipf: pyzipper.ZipFile, file_path: pathlib.Path, arcname: str) -> None:
+def _add_file_to_zip(zipf: pyzipper.ZipFile, file_path: pathlib.Path|str, arcname: str) -> None:
     """添加单个文件到ZIP压缩包"""
     zipf.write(file_path, arcname)
 
@@ -18,23 +19,31 @@ def _add_directory_to_zip(zipf: pyzipper.ZipFile, directory_path: pathlib.Path)
     """
     添加整个目录到ZIP压缩包，确保文件按路径排序[6](@ref)
     """
-    all_files = []
-    
-    # 递归收集所有文件路径[1,2](@ref)
-    for file_path in directory_path.rglob('*'):
-        if file_path.is_file():
-            # 计算在ZIP中的相对路径[11](@ref)
-            relative_path = file_path.relative_to(directory_path.parent 
-                if directory_path.parent != directory_path 
-                else directory_path)
-            all_files.append((file_path, str(relative_path)))
-    
-    # 按路径排序确保一致性[6](@ref)
-    all_files.sort(key=lambda x: x[1].lower())
-    
+    # 文件路径与ZIP内相对路径分别存放在两个列表中，下标一一对应
+    paths: list[str] = []
+    arcnames: list[str] = []
+
+    # 用os.scandir深度优先递归收集所有文件路径[1,2](@ref)，DirEntry自带文件类型信息
+    # ZIP中的相对路径以目录的父目录为基准[11](@ref)，遍历时直接由目录名逐层拼接
+    stack = [(str(directory_path), directory_path.name)]
+    while stack:
+        current_dir, current_arc = stack.pop()
+        with os.scandir(current_dir) as entries:
+            for entry in entries:
+                arcname = f'{current_arc}{os.sep}{entry.name}' if current_arc else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, arcname))
+                elif entry.is_file():
+                    paths.append(entry.path)
+                    arcnames.append(arcname)
+
+    # 按路径排序确保一致性[6](@ref)，只对下标排序，排序键预先转为小写存放在并行列表中
+    sort_keys = [arcname.lower() for arcname in arcnames]
+    order = sorted(range(len(arcnames)), key=sort_keys.__getitem__)
+
     # 按排序后的顺序添加文件
-    for file_path, arcname in all_files:
-        _add_file_to_zip(zipf, file_path, arcname)
+    for i in order:
+        _add_file_to_zip(zipf, paths[i], arcnames[i])
 
 
 class ZipService:
@@ -79,8 +88,8 @@ class ZipService:
                         raise ValueError(f"不支持的源路径类型: {source_item}")
                     return ziped_item
             except Exception as e:
-                if ziped_item.exists():
-                    ziped_item.unlink()
+                # 压缩失败时删除不完整的压缩包，文件不存在时直接忽略
+                ziped_item.unlink(missing_ok=True)
                 raise e
     @staticmethod
     def unzip_item(zip_path: PathLike, target_dir: PathLike = None, password: str | None = None) -> pathlib.Path:
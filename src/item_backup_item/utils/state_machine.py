@@ -1,3 +1,5 @@
+import threading
+
 
 class StateMachine:
     '''A simple state machine class'''
@@ -5,21 +7,31 @@ class StateMachine:
     '''Initialize the state machine with a list of states and the current state set to None.'''
     _instance = None
     _is_initialized = False
+    # 保护单例的创建与初始化，避免多个线程同时创建或重复初始化实例
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(StateMachine, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(StateMachine, cls).__new__(cls)
         return cls._instance
 
 
     def __init__(self):
         if self._is_initialized:
             return
-        self._is_initialized = True
-        self.state_list = ['classify','hashed','zipped','zip_file_hashed','unzipped','unzip_hashed','uploaded','delete']
-        self.state_dict = {state: i for i, state in enumerate(self.state_list)}
-        print(f'state_dict:{self.state_dict}')
-        self.current_state = None
+        with self._lock:
+            if self._is_initialized:
+                return
+            self.state_list = ('classify','hashed','zipped','zip_file_hashed','unzipped','unzip_hashed','uploaded','delete')
+            self.state_dict = {state: i for i, state in enumerate(self.state_list)}
+            # 预先计算每个状态的下一个与上一个状态，查询时只需一次字典查找
+            self._next_map = dict(zip(self.state_list, self.state_list[1:] + (None,)))
+            self._prev_map = dict(zip(self.state_list, (None,) + self.state_list[:-1]))
+            self.current_state = None
+            # 全部属性设置完成后再标记为已初始化，其他线程不会看到未初始化完成的实例
+            self._is_initialized = True
     
     def set_state(self, state):
         self.current_state = state
@@ -33,21 +45,17 @@ class StateMachine:
     def get_next_state(self):
         if self.current_state is None:
             raise ValueError("Current state is None, please use .set_state to set current state first")
-        current_index = self.state_dict[self.current_state]
-        next_index = current_index + 1
-        if next_index >= len(self.state_list):
+        next_state = self._next_map[self.current_state]
+        if next_state is None:
             print("Next state is None, current state is the last state")
-            return None
-        return self.state_list[next_index]
+        return next_state
     def get_previous_state(self):
         if self.current_state is None:
             raise ValueError("Current state is None, please use .set_state to set current state first")
-        current_index = self.state_dict[self.current_state]
-        previous_index = current_index - 1
-        if previous_index < 0:
+        previous_state = self._prev_map[self.current_state]
+        if previous_state is None:
             print("Previous state is None, current state is the first state")
-            return None
-        return self.state_list[previous_index]
+        return previous_state
     def get_state_by_index(self, step:int):
         '''
         从1开始计数，1表示第一个状态,-1表示最后一个状态
@@ -62,10 +70,4 @@ class StateMachine:
 
 def get_state_machine():
     """Get the singleton instance of the StateMachine class."""
-    machine = StateMachine()
-    print("Get state machine instance")
-    try:
-        print(f"Current state: {machine.get_current_state()}")
-    except Exception as e:
-        print(f"Error: {e}")
-    return machine
+    return StateMachine()
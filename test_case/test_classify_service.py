@@ -0,0 +1,67 @@
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+from item_backup_item.service.classfiy_service import classify_item, _iter_file_sizes
+
+
+def _make_tree(root: Path) -> Path:
+    """
+    创建包含多层子目录、隐藏文件、空目录以及(系统支持时)符号链接的测试目录
+    """
+    tree = root / 'tree'
+    (tree / 'a' / 'b').mkdir(parents=True)
+    (tree / '.hidden_dir').mkdir()
+    (tree / 'empty').mkdir()
+    (tree / 'x.txt').write_bytes(b'1' * 10)
+    (tree / '.dotfile').write_bytes(b'2' * 20)
+    (tree / 'a' / 'y.bin').write_bytes(b'3' * 30)
+    (tree / 'a' / 'b' / 'z').write_bytes(b'4' * 40)
+    (tree / '.hidden_dir' / 'h').write_bytes(b'5' * 50)
+    outside = root / 'outside'
+    outside.mkdir()
+    (outside / 'big').write_bytes(b'6' * 100)
+    try:
+        os.symlink(outside, tree / 'link_dir', target_is_directory=True)
+        os.symlink(tree / 'x.txt', tree / 'link_file')
+    except OSError:
+        pass  # Windows下无权限创建符号链接时跳过
+    return tree
+
+
+def _baseline_files(tree: Path) -> list[Path]:
+    # 改写前的实现：rglob收集所有文件
+    return [i for i in tree.rglob('*') if i.is_file()]
+
+
+def test_iter_file_sizes_matches_rglob():
+    with tempfile.TemporaryDirectory() as folder:
+        tree = _make_tree(Path(folder))
+        baseline = _baseline_files(tree)
+        sizes = list(_iter_file_sizes(tree))
+        assert len(sizes) == len(baseline)
+        assert sorted(sizes) == sorted(i.stat().st_size for i in baseline)
+
+
+def test_classify_relative_folder():
+    with tempfile.TemporaryDirectory() as folder:
+        tree = _make_tree(Path(folder))
+        expected_size = sum(i.stat().st_size for i in _baseline_files(tree))
+        with contextlib.chdir(folder):
+            result = classify_item(Path('tree'))
+        assert result == {Path('tree'): {'classify_result': 'normal_folder', 'item_type': 'folder', 'item_size': expected_size}}
+
+
+def test_classify_empty_folder_and_file():
+    with tempfile.TemporaryDirectory() as folder:
+        tree = _make_tree(Path(folder))
+        assert classify_item(tree / 'empty')[tree / 'empty']['classify_result'] == 'empty_folder'
+        assert classify_item(tree / '.dotfile') == {tree / '.dotfile': {'classify_result': 'normal_file', 'item_type': 'file', 'item_size': 20}}
+
+
+if __name__ == "__main__":
+    test_iter_file_sizes_matches_rglob()
+    test_classify_relative_folder()
+    test_classify_empty_folder_and_file()
+    print("all passed")
@@ -10,8 +10,8 @@ def test_upload_service():
         'chunk_size': 20*1024*1024,
         'rtype': 1
     }
-    upload_service = UploadService(**params)
-    upload_service.precreate().upload().create()
+    with UploadService(**params) as upload_service:
+        upload_service.precreate().upload().create()
 
 def new_test_upload_service():
     params = {
@@ -24,11 +24,11 @@ def new_test_upload_service():
         'chunk_size': 20*1024*1024,
         'rtype': 1
     }
-    upload_service = UploadService()
-    result = upload_service.upload_file(**params)
-    print(f"result: {result}")
-    result1 = upload_service.upload_file(**params1)
-    print(f"result1: {result1}")
+    with UploadService() as upload_service:
+        result = upload_service.upload_file(**params)
+        print(f"result: {result}")
+        result1 = upload_service.upload_file(**params1)
+        print(f"result1: {result1}")
 
 if __name__ == "__main__":
     test_upload_service()
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from item_backup_item.service.upload_service import UploadService
+
+
+CHUNK_SIZE = 1024
+
+
+def _make_service(folder: Path, size: int) -> UploadService:
+    env_path = folder / 'upload.env'
+    env_path.write_text('BAIDU_PAN_ACCESS_TOKEN=test\n')
+    source = folder / 'source.bin'
+    source.write_bytes(os.urandom(size))
+    return UploadService(source, chunk_size=CHUNK_SIZE, env_path=env_path)
+
+
+def _check_split_and_block_list(upload_service: UploadService):
+    block_list = json.loads(upload_service._create_block_list())
+    parts = upload_service.tmp_list
+    # 除最后一个分片外每个分片都恰好为chunk_size字节
+    assert [part.stat().st_size for part in parts[:-1]] == [CHUNK_SIZE] * (len(parts) - 1)
+    # 分片按顺序拼接后与源文件一致
+    assert b''.join(part.read_bytes() for part in parts) == upload_service.file_path.read_bytes()
+    # 按源文件区间计算的MD5与各分片文件的MD5一致
+    assert block_list == [hashlib.md5(part.read_bytes()).hexdigest() for part in parts]
+
+
+def test_split_file_and_block_list():
+    with tempfile.TemporaryDirectory() as folder:
+        # 文件大小不是chunk_size的整数倍
+        with _make_service(Path(folder), 5 * CHUNK_SIZE + 123) as upload_service:
+            _check_split_and_block_list(upload_service)
+            assert len(upload_service.tmp_list) == 6
+
+
+def test_split_file_short_reads():
+    with tempfile.TemporaryDirectory() as folder:
+        with _make_service(Path(folder), 5 * CHUNK_SIZE + 123) as upload_service:
+            # 模拟os.read每次只返回部分数据，分片边界仍需与MD5区间一致
+            real_read = os.read
+            with mock.patch('os.read', lambda fd, n: real_read(fd, min(n, 300))):
+                _check_split_and_block_list(upload_service)
+
+
+def test_remove_parts_keeps_other_files():
+    with tempfile.TemporaryDirectory() as folder:
+        with _make_service(Path(folder), 3 * CHUNK_SIZE) as upload_service:
+            upload_service._split_file()
+            temp_dir = Path(upload_service.temp_dir)
+            (temp_dir / 'other.bin.part0000').write_bytes(b'other')
+            (temp_dir / 'source.bin.partx').write_bytes(b'not a part')
+            upload_service._remove_parts()
+            assert sorted(p.name for p in temp_dir.iterdir()) == ['other.bin.part0000', 'source.bin.partx']
+
+
+if __name__ == "__main__":
+    test_split_file_and_block_list()
+    test_split_file_short_reads()
+    test_remove_parts_keeps_other_files()
+    print("all passed")
@@ -0,0 +1,55 @@
+from item_backup_item.service.upload_service.utils import (
+    extract_date_and_password_from_path,
+    extract_date_and_password_from_path_strict,
+)
+
+
+def test_extract_documented_path():
+    # 文档示例路径，两种提取方式结果一致
+    path = r"D:\压缩测试\20260115\解压密码_H_x123456789"
+    assert extract_date_and_password_from_path(path) == ("20260115", "H_x123456789")
+    posix_path = "D:/压缩测试/20260115/解压密码_H_x123456789"
+    assert extract_date_and_password_from_path_strict(posix_path) == ("20260115", "H_x123456789")
+
+
+def test_extract_password_digits_not_date():
+    # 密码中的8位数字属于密码，不作为日期候选
+    assert extract_date_and_password_from_path("D:/备份/解压密码_20240101") == (None, "20240101")
+
+
+def test_extract_later_date_in_same_part():
+    # 同一路径部分中前面的8位数字不是有效日期时，继续匹配后面的有效日期
+    assert extract_date_and_password_from_path("D:/备份/99999999_20240101/a.zip") == ("20240101", None)
+    assert extract_date_and_password_from_path("D:/20241301/20240115/a.zip") == ("20240115", None)
+
+
+def test_extract_first_match_in_path_order():
+    path = "D:/20240101/解压密码_first/20240202/密码-second"
+    assert extract_date_and_password_from_path(path) == ("20240101", "first")
+
+
+def test_extract_from_file_name():
+    assert extract_date_and_password_from_path("D:/备份/资料_解压密码_abc.zip") == (None, "abc")
+    assert extract_date_and_password_from_path("D:/备份/20240101_解压密码_abc.zip") == ("20240101", "abc")
+    assert extract_date_and_password_from_path("D:/备份/a.zip") == (None, None)
+
+
+def test_extract_strict_last_match_wins():
+    # 严格模式下日期必须是完整的路径部分，多个匹配时取最深一层
+    path = "D:/20240101/密码-first/20240202/密码-second/a.zip"
+    assert extract_date_and_password_from_path_strict(path) == ("20240202", "second")
+
+
+def test_extract_strict_requires_whole_part_date():
+    assert extract_date_and_password_from_path_strict("D:/备份/20240101_abc/a.zip") == (None, None)
+
+
+if __name__ == "__main__":
+    test_extract_documented_path()
+    test_extract_password_digits_not_date()
+    test_extract_later_date_in_same_part()
+    test_extract_first_match_in_path_order()
+    test_extract_from_file_name()
+    test_extract_strict_last_match_wins()
+    test_extract_strict_requires_whole_part_date()
+    print("all passed")
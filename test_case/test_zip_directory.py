@@ -0,0 +1,79 @@
+import contextlib
+import os
+import tempfile
+from pathlib import Path
+
+from item_backup_item.service.zip_service import _add_directory_to_zip
+
+
+class _RecordingZip:
+    """只记录写入顺序与ZIP内路径的假ZipFile"""
+    def __init__(self):
+        self.written: list[tuple[str, str]] = []
+
+    def write(self, file_path, arcname):
+        self.written.append((os.path.normpath(str(file_path)), arcname))
+
+
+def _make_tree(root: Path) -> Path:
+    tree = root / 'tree'
+    (tree / 'A' / 'b').mkdir(parents=True)
+    (tree / '.hidden_dir').mkdir()
+    (tree / 'empty').mkdir()
+    (tree / 'x.txt').write_bytes(b'1')
+    (tree / '.dotfile').write_bytes(b'2')
+    (tree / 'a.txt').write_bytes(b'3')
+    (tree / 'A' / 'Y.bin').write_bytes(b'4')
+    (tree / 'A' / 'b' / 'z').write_bytes(b'5')
+    (tree / '.hidden_dir' / 'h').write_bytes(b'6')
+    outside = root / 'outside'
+    outside.mkdir()
+    (outside / 'big').write_bytes(b'7')
+    try:
+        os.symlink(outside, tree / 'link_dir', target_is_directory=True)
+        os.symlink(tree / 'x.txt', tree / 'link_file')
+    except OSError:
+        pass  # Windows下无权限创建符号链接时跳过
+    return tree
+
+
+def _baseline_entries(directory_path: Path) -> list[tuple[str, str]]:
+    # 改写前的实现：rglob收集文件，以目录的父目录为基准计算相对路径，按小写路径排序
+    all_files = []
+    for file_path in directory_path.rglob('*'):
+        if file_path.is_file():
+            relative_path = file_path.relative_to(directory_path.parent
+                if directory_path.parent != directory_path
+                else directory_path)
+            all_files.append((os.path.normpath(str(file_path)), str(relative_path)))
+    all_files.sort(key=lambda x: x[1].lower())
+    return all_files
+
+
+def _zip_entries(directory_path: Path) -> list[tuple[str, str]]:
+    zipf = _RecordingZip()
+    _add_directory_to_zip(zipf, directory_path)  # type: ignore
+    return zipf.written
+
+
+def test_directory_arcnames_match_baseline():
+    with tempfile.TemporaryDirectory() as folder:
+        tree = _make_tree(Path(folder))
+        entries = _zip_entries(tree)
+        assert entries == _baseline_entries(tree)
+        assert os.path.join('tree', '.hidden_dir', 'h') in [arcname for _, arcname in entries]
+
+
+def test_relative_directory_arcnames_match_baseline():
+    with tempfile.TemporaryDirectory() as folder:
+        _make_tree(Path(folder))
+        with contextlib.chdir(folder):
+            entries = _zip_entries(Path('tree'))
+            assert entries == _baseline_entries(Path('tree'))
+        assert all(arcname.startswith('tree' + os.sep) for _, arcname in entries)
+
+
+if __name__ == "__main__":
+    test_directory_arcnames_match_baseline()
+    test_relative_directory_arcnames_match_baseline()
+    print("all passed")